@@ -1356,19 +1356,40 @@ class AgentExecutor(Chain):
         for agent_action in actions:
             yield agent_action
 
-        # Use asyncio.gather to run multiple tool.arun() calls concurrently
-        result = await asyncio.gather(
+        # Use asyncio.gather to run multiple tool.arun() calls concurrently.
+        # Tools can opt out of concurrent execution (e.g. because they mutate
+        # shared state) via metadata {"parallel_safe": False}; those actions
+        # run sequentially after the parallel batch.
+        parallel: List[Tuple[int, AgentAction]] = []
+        sequential: List[Tuple[int, AgentAction]] = []
+        for index, agent_action in enumerate(actions):
+            tool = name_to_tool_map.get(agent_action.tool)
+            metadata = (tool.metadata or {}) if tool is not None else {}
+            if metadata.get("parallel_safe", True):
+                parallel.append((index, agent_action))
+            else:
+                sequential.append((index, agent_action))
+        steps: Dict[int, AgentStep] = {}
+        parallel_steps = await asyncio.gather(
             *[
                 self._aperform_agent_action(
                     name_to_tool_map, color_mapping, agent_action, run_manager
                 )
-                for agent_action in actions
+                for _, agent_action in parallel
             ],
         )
+        for (index, _), step in zip(parallel, parallel_steps):
+            steps[index] = step
+        for index, agent_action in sequential:
+            steps[index] = await self._aperform_agent_action(
+                name_to_tool_map, color_mapping, agent_action, run_manager
+            )
 
+        # Yield observations in the order the agent emitted the actions, so
+        # follow-up messages line up with the model's tool call order.
         # TODO This could yield each result as it becomes available
-        for chunk in result:
-            yield chunk
+        for index in range(len(actions)):
+            yield steps[index]
 
     async def _aperform_agent_action(
         self,
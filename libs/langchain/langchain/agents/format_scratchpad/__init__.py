@@ -12,10 +12,11 @@ from langchain.agents.format_scratchpad.openai_functions import (
     format_to_openai_functions,
 )
 from langchain.agents.format_scratchpad.tools import format_to_tool_messages
-from langchain.agents.format_scratchpad.xml import format_xml
+from langchain.agents.format_scratchpad.xml import format_xml, format_xml_messages
 
 __all__ = [
     "format_xml",
+    "format_xml_messages",
     "format_to_openai_function_messages",
     "format_to_openai_functions",
     "format_to_tool_messages",
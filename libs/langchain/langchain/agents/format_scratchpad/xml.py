@@ -1,6 +1,7 @@
 from typing import List, Tuple
 
 from langchain_core.agents import AgentAction
+from langchain_core.messages import BaseMessage, HumanMessage
 
 
 def format_xml(
@@ -21,3 +22,32 @@ def format_xml(
             f"</tool_input><observation>{observation}</observation>"
         )
     return log
+
+
+def format_xml_messages(
+    intermediate_steps: List[Tuple[AgentAction, str]],
+) -> List[BaseMessage]:
+    """Format the intermediate steps as a single XML human message.
+
+    Each step is wrapped in an explicit ``<step>`` block so tool outputs stay
+    delimited from each other in the model's context, and the rendered prefix
+    for earlier steps is byte-stable when a new step is appended — which keeps
+    provider-side prompt caches warm across turns.
+
+    Args:
+        intermediate_steps: The intermediate steps.
+
+    Returns:
+        A single-element message list, or an empty list when there are no
+        steps.
+    """
+    if not intermediate_steps:
+        return []
+    log = ""
+    for index, (action, observation) in enumerate(intermediate_steps):
+        log += (
+            f'<step index="{index}"><action tool="{action.tool}">'
+            f"{action.tool_input}</action>"
+            f"<observation>{observation}</observation></step>"
+        )
+    return [HumanMessage(content=log)]
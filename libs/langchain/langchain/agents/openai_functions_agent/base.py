@@ -1,5 +1,17 @@
 """Module implements an agent that uses OpenAI's APIs function enabled API."""
-from typing import Any, List, Optional, Sequence, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 from langchain_core._api import deprecated
 from langchain_core.agents import AgentAction, AgentFinish
@@ -7,8 +19,11 @@ from langchain_core.callbacks import BaseCallbackManager, Callbacks
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.messages import (
     BaseMessage,
+    BaseMessageChunk,
     SystemMessage,
 )
+from langchain_core.outputs import ChatGeneration
+from langchain_core.prompt_values import PromptValue
 from langchain_core.prompts import BasePromptTemplate
 from langchain_core.prompts.chat import (
     BaseMessagePromptTemplate,
@@ -16,7 +31,7 @@ from langchain_core.prompts.chat import (
     HumanMessagePromptTemplate,
     MessagesPlaceholder,
 )
-from langchain_core.pydantic_v1 import root_validator
+from langchain_core.pydantic_v1 import PrivateAttr, root_validator
 from langchain_core.runnables import Runnable, RunnablePassthrough
 from langchain_core.tools import BaseTool
 from langchain_core.utils.function_calling import convert_to_openai_function
@@ -25,10 +40,102 @@ from langchain.agents import BaseSingleActionAgent
 from langchain.agents.format_scratchpad.openai_functions import (
     format_to_openai_function_messages,
 )
+from langchain.agents.format_scratchpad.xml import format_xml_messages
+from langchain.agents.openai_functions_agent.plan_cache import (
+    BasePlanCache,
+    plan_cache_key,
+)
 from langchain.agents.output_parsers.openai_functions import (
     OpenAIFunctionsAgentOutputParser,
 )
 
+# Shared parser for the factory path below. The parser is stateless, so every
+# constructed pipeline can reuse the same instance.
+_output_parser = OpenAIFunctionsAgentOutputParser()
+
+# Marker understood by providers that support explicit prompt caching
+# (e.g. Anthropic cache_control breakpoints). Attached to the static prefix
+# of the prompt so the provider can reuse its KV cache across plan turns.
+_CACHE_CONTROL_KWARGS = {"cache_control": {"type": "ephemeral"}}
+
+# Serializer for a single tool's function schema.
+ToolSerializer = Callable[[BaseTool], dict]
+
+
+def _compact_schema(schema: Any) -> Any:
+    """Strip token overhead from a JSON schema without changing its meaning."""
+    if isinstance(schema, dict):
+        compacted = {}
+        for key, value in schema.items():
+            # Pydantic emits a title per model/field; providers ignore them.
+            if key == "title":
+                continue
+            if key == "description" and not value:
+                continue
+            if key == "required" and not value:
+                continue
+            # "type": "object" is implied when properties are present.
+            if key == "type" and value == "object" and "properties" in schema:
+                continue
+            compacted[key] = _compact_schema(value)
+        return compacted
+    if isinstance(schema, list):
+        return [_compact_schema(item) for item in schema]
+    return schema
+
+
+# Rendered functions payloads keyed by tool identity, so servers that
+# re-construct agents per request reuse the same schema list object and the
+# serialized prefix stays byte-identical for provider-side prompt caches.
+_FUNCTIONS_PAYLOAD_CACHE: Dict[Tuple, List[dict]] = {}
+_FUNCTIONS_PAYLOAD_CACHE_SIZE = 256
+
+
+def _get_functions_payload(tools: Sequence[BaseTool]) -> List[dict]:
+    """Render the functions payload for tools, memoized across constructions."""
+    key = tuple((t.name, t.description, id(t.args_schema)) for t in tools)
+    payload = _FUNCTIONS_PAYLOAD_CACHE.get(key)
+    if payload is None:
+        payload = format_tools_for_llm(tools)
+        if len(_FUNCTIONS_PAYLOAD_CACHE) >= _FUNCTIONS_PAYLOAD_CACHE_SIZE:
+            _FUNCTIONS_PAYLOAD_CACHE.pop(next(iter(_FUNCTIONS_PAYLOAD_CACHE)))
+        _FUNCTIONS_PAYLOAD_CACHE[key] = payload
+    return payload
+
+
+def _get_agent_scratchpad(x: dict) -> List[BaseMessage]:
+    """Format the intermediate steps of an executor input into messages."""
+    steps = x["intermediate_steps"]
+    return format_to_openai_function_messages(steps) if steps else []
+
+
+def format_tools_for_llm(
+    tools: Sequence[BaseTool],
+    serializer: Union[str, ToolSerializer] = "openai_functions",
+) -> List[dict]:
+    """Render tool schemas into the functions payload sent to the model.
+
+    Args:
+        tools: Tools to render.
+        serializer: Either "openai_functions" (the standard OpenAI function
+            schema), "compact" (the standard schema with titles, empty fields
+            and implied defaults stripped, saving tokens on every turn), or a
+            callable mapping a tool to a schema dict.
+
+    Returns:
+        One schema dict per tool.
+    """
+    if callable(serializer):
+        return [serializer(t) for t in tools]
+    if serializer == "openai_functions":
+        return [convert_to_openai_function(t) for t in tools]
+    if serializer == "compact":
+        return [_compact_schema(convert_to_openai_function(t)) for t in tools]
+    raise ValueError(
+        "serializer should be 'openai_functions', 'compact' or a callable, "
+        f"got {serializer}"
+    )
+
 
 @deprecated("0.1.0", alternative="create_openai_functions_agent", removal="0.3.0")
 class OpenAIFunctionsAgent(BaseSingleActionAgent):
@@ -41,6 +148,20 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
         prompt: The prompt for this agent, should support agent_scratchpad as one
             of the variables. For an easy way to construct this prompt, use
             `OpenAIFunctionsAgent.create_prompt(...)`
+        plan_cache: Optional cache for plan decisions. On a hit for the current
+            agent state the stored AgentAction/AgentFinish is returned without
+            calling the LLM.
+        functions_serializer: How tool schemas are rendered into the functions
+            payload; see `format_tools_for_llm`.
+        streaming: Whether `aplan` streams the LLM response and accumulates it
+            instead of blocking on the complete message. Streaming surfaces
+            tokens to callbacks as they arrive, overlapping LLM tail latency
+            with downstream work.
+        scratchpad_format: How intermediate steps are rendered into the agent
+            scratchpad. "messages" reconstructs the AI/function message
+            history; "xml" emits a single human message of tag-delimited
+            ``<step>`` blocks, which is more token-compact and keeps earlier
+            steps byte-stable for provider prompt caches.
     """
 
     llm: BaseLanguageModel
@@ -49,10 +170,24 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
     output_parser: Type[
         OpenAIFunctionsAgentOutputParser
     ] = OpenAIFunctionsAgentOutputParser
+    plan_cache: Optional[BasePlanCache] = None
+    functions_serializer: Union[str, ToolSerializer] = "openai_functions"
+    streaming: bool = False
+    scratchpad_format: Literal["messages", "xml"] = "messages"
+    _functions: Optional[List[dict]] = PrivateAttr(default=None)
+    _non_scratchpad_keys: Optional[Tuple[str, ...]] = PrivateAttr(default=None)
+    _allowed_tool_names: Optional[Tuple[str, ...]] = PrivateAttr(default=None)
+
+    class Config:
+        arbitrary_types_allowed = True
 
     def get_allowed_tools(self) -> List[str]:
         """Get allowed tools."""
-        return [t.name for t in self.tools]
+        # Executors may call this per turn; the tool set is fixed after
+        # construction, so collect the names once.
+        if self._allowed_tool_names is None:
+            self._allowed_tool_names = tuple(t.name for t in self.tools)
+        return list(self._allowed_tool_names)
 
     @root_validator
     def validate_prompt(cls, values: dict) -> dict:
@@ -69,9 +204,56 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
         """Get input keys. Input refers to user input here."""
         return ["input"]
 
+    def _format_prompt(
+        self,
+        intermediate_steps: List[Tuple[AgentAction, str]],
+        selected_inputs: Dict[str, Any],
+    ) -> PromptValue:
+        """Render the prompt for the current agent state.
+
+        Completes ``selected_inputs`` (the non-scratchpad inputs) in place with
+        the formatted scratchpad before rendering.
+        """
+        # The first turn of every loop has no steps; skip the formatting call
+        # for the guaranteed-empty result.
+        if not intermediate_steps:
+            agent_scratchpad: List[BaseMessage] = []
+        elif self.scratchpad_format == "xml":
+            agent_scratchpad = format_xml_messages(intermediate_steps)
+        else:
+            agent_scratchpad = format_to_openai_function_messages(intermediate_steps)
+        selected_inputs["agent_scratchpad"] = agent_scratchpad
+        return self.prompt.format_prompt(**selected_inputs)
+
+    def _prepare_messages(
+        self,
+        intermediate_steps: List[Tuple[AgentAction, str]],
+        selected_inputs: Dict[str, Any],
+    ) -> List[BaseMessage]:
+        """Render the prompt messages shared by `plan` and `aplan`."""
+        return self._format_prompt(intermediate_steps, selected_inputs).to_messages()
+
+    def _selected_input_keys(self) -> Tuple[str, ...]:
+        """Prompt input keys excluding the agent scratchpad.
+
+        The prompt is fixed after construction, so the filtered key tuple is
+        computed once instead of re-filtering input_variables on every turn.
+        """
+        if self._non_scratchpad_keys is None:
+            self._non_scratchpad_keys = tuple(
+                k for k in self.prompt.input_variables if k != "agent_scratchpad"
+            )
+        return self._non_scratchpad_keys
+
     @property
     def functions(self) -> List[dict]:
-        return [dict(convert_to_openai_function(t)) for t in self.tools]
+        # Tool schemas are static after construction, so only render them once
+        # instead of re-running schema introspection on every plan turn.
+        if self._functions is None:
+            self._functions = format_tools_for_llm(
+                self.tools, self.functions_serializer
+            )
+        return self._functions
 
     def plan(
         self,
@@ -89,13 +271,14 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
         Returns:
             Action specifying what tool to use.
         """
-        agent_scratchpad = format_to_openai_function_messages(intermediate_steps)
-        selected_inputs = {
-            k: kwargs[k] for k in self.prompt.input_variables if k != "agent_scratchpad"
-        }
-        full_inputs = dict(**selected_inputs, agent_scratchpad=agent_scratchpad)
-        prompt = self.prompt.format_prompt(**full_inputs)
-        messages = prompt.to_messages()
+        selected_inputs = {k: kwargs[k] for k in self._selected_input_keys()}
+        cache_key = None
+        if self.plan_cache is not None and with_functions:
+            cache_key = plan_cache_key(intermediate_steps, selected_inputs)
+            cached_decision = self.plan_cache.lookup(cache_key)
+            if cached_decision is not None:
+                return cached_decision
+        messages = self._prepare_messages(intermediate_steps, selected_inputs)
         if with_functions:
             predicted_message = self.llm.predict_messages(
                 messages,
@@ -108,6 +291,8 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
                 callbacks=callbacks,
             )
         agent_decision = self.output_parser._parse_ai_message(predicted_message)
+        if self.plan_cache is not None and cache_key is not None:
+            self.plan_cache.update(cache_key, agent_decision)
         return agent_decision
 
     async def aplan(
@@ -126,19 +311,121 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
         Returns:
             Action specifying what tool to use.
         """
-        agent_scratchpad = format_to_openai_function_messages(intermediate_steps)
-        selected_inputs = {
-            k: kwargs[k] for k in self.prompt.input_variables if k != "agent_scratchpad"
-        }
-        full_inputs = dict(**selected_inputs, agent_scratchpad=agent_scratchpad)
-        prompt = self.prompt.format_prompt(**full_inputs)
-        messages = prompt.to_messages()
-        predicted_message = await self.llm.apredict_messages(
-            messages, functions=self.functions, callbacks=callbacks
-        )
+        selected_inputs = {k: kwargs[k] for k in self._selected_input_keys()}
+        cache_key = None
+        if self.plan_cache is not None:
+            cache_key = plan_cache_key(intermediate_steps, selected_inputs)
+            cached_decision = self.plan_cache.lookup(cache_key)
+            if cached_decision is not None:
+                return cached_decision
+        messages = self._prepare_messages(intermediate_steps, selected_inputs)
+        if self.streaming:
+            predicted_message = await self._astream_message(messages, callbacks)
+        else:
+            predicted_message = await self.llm.apredict_messages(
+                messages, functions=self.functions, callbacks=callbacks
+            )
         agent_decision = self.output_parser._parse_ai_message(predicted_message)
+        if self.plan_cache is not None and cache_key is not None:
+            self.plan_cache.update(cache_key, agent_decision)
         return agent_decision
 
+    async def _astream_message(
+        self,
+        messages: List[BaseMessage],
+        callbacks: Callbacks,
+    ) -> BaseMessage:
+        """Stream the LLM response and accumulate it into a single message."""
+        predicted_message: Optional[BaseMessageChunk] = None
+        async for chunk in self.llm.astream(
+            messages, {"callbacks": callbacks}, functions=self.functions
+        ):
+            if predicted_message is None:
+                predicted_message = chunk
+            else:
+                predicted_message = predicted_message + chunk
+        if predicted_message is None:
+            raise ValueError("LLM stream produced no output")
+        return predicted_message
+
+    def plan_batch(
+        self,
+        inputs: List[Dict[str, Any]],
+        intermediate_steps: Optional[List[List[Tuple[AgentAction, str]]]] = None,
+        callbacks: Callbacks = None,
+    ) -> List[Union[AgentAction, AgentFinish]]:
+        """Plan for a batch of independent agent states in a single LLM request.
+
+        Useful for bulk workloads (evaluations, backtests) where many inputs
+        run through the same agent: the prompts are prepared up front and sent
+        as one batched generate call, so the provider integration can apply
+        its own batching, concurrency and rate-limit handling.
+
+        Args:
+            inputs: User inputs, one dict per agent state.
+            intermediate_steps: Steps taken to date for each state, along with
+                observations. Defaults to no steps for every input.
+            callbacks: Callbacks to run.
+
+        Returns:
+            Parsed decisions, one per input, in input order.
+        """
+        if intermediate_steps is None:
+            intermediate_steps = [[] for _ in inputs]
+        if len(intermediate_steps) != len(inputs):
+            raise ValueError(
+                "`intermediate_steps` should have one entry per input, "
+                f"got {len(intermediate_steps)} for {len(inputs)} inputs"
+            )
+        prompts = [
+            self._prepare_batch_prompt(kwargs, steps)
+            for kwargs, steps in zip(inputs, intermediate_steps)
+        ]
+        result = self.llm.generate_prompt(
+            prompts, callbacks=callbacks, functions=self.functions
+        )
+        parse = self.output_parser._parse_ai_message
+        return [
+            parse(cast(ChatGeneration, generation[0]).message)
+            for generation in result.generations
+        ]
+
+    async def aplan_batch(
+        self,
+        inputs: List[Dict[str, Any]],
+        intermediate_steps: Optional[List[List[Tuple[AgentAction, str]]]] = None,
+        callbacks: Callbacks = None,
+    ) -> List[Union[AgentAction, AgentFinish]]:
+        """Async version of `plan_batch`."""
+        if intermediate_steps is None:
+            intermediate_steps = [[] for _ in inputs]
+        if len(intermediate_steps) != len(inputs):
+            raise ValueError(
+                "`intermediate_steps` should have one entry per input, "
+                f"got {len(intermediate_steps)} for {len(inputs)} inputs"
+            )
+        prompts = [
+            self._prepare_batch_prompt(kwargs, steps)
+            for kwargs, steps in zip(inputs, intermediate_steps)
+        ]
+        result = await self.llm.agenerate_prompt(
+            prompts, callbacks=callbacks, functions=self.functions
+        )
+        parse = self.output_parser._parse_ai_message
+        return [
+            parse(cast(ChatGeneration, generation[0]).message)
+            for generation in result.generations
+        ]
+
+    def _prepare_batch_prompt(
+        self,
+        kwargs: Dict[str, Any],
+        intermediate_steps: List[Tuple[AgentAction, str]],
+    ) -> PromptValue:
+        """Render the prompt for a single batch entry."""
+        selected_inputs = {k: kwargs[k] for k in self._selected_input_keys()}
+        return self._format_prompt(intermediate_steps, selected_inputs)
+
     def return_stopped_response(
         self,
         early_stopping_method: str,
@@ -175,6 +462,7 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
             content="You are a helpful AI assistant."
         ),
         extra_prompt_messages: Optional[List[BaseMessagePromptTemplate]] = None,
+        cache_static_prefix: bool = False,
     ) -> ChatPromptTemplate:
         """Create prompt for this agent.
 
@@ -183,6 +471,11 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
                 first in the prompt.
             extra_prompt_messages: Prompt messages that will be placed between the
                 system message and the new human input.
+            cache_static_prefix: If True, mark the system message and the last
+                message before the agent scratchpad with provider cache-control
+                metadata, so providers that support prompt caching can reuse
+                the static prefix across plan turns. Only enable this for
+                providers that accept ``cache_control`` on messages.
 
         Returns:
             A prompt template to pass into this agent.
@@ -190,6 +483,15 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
         _prompts = extra_prompt_messages or []
         messages: List[Union[BaseMessagePromptTemplate, BaseMessage]]
         if system_message:
+            if cache_static_prefix:
+                system_message = system_message.copy(
+                    update={
+                        "additional_kwargs": {
+                            **system_message.additional_kwargs,
+                            **_CACHE_CONTROL_KWARGS,
+                        }
+                    }
+                )
             messages = [system_message]
         else:
             messages = []
@@ -197,7 +499,12 @@ class OpenAIFunctionsAgent(BaseSingleActionAgent):
         messages.extend(
             [
                 *_prompts,
-                HumanMessagePromptTemplate.from_template("{input}"),
+                HumanMessagePromptTemplate.from_template(
+                    "{input}",
+                    additional_kwargs=(
+                        dict(_CACHE_CONTROL_KWARGS) if cache_static_prefix else {}
+                    ),
+                ),
                 MessagesPlaceholder(variable_name="agent_scratchpad"),
             ]
         )
@@ -305,15 +612,11 @@ def create_openai_functions_agent(
             "Prompt must have input variable `agent_scratchpad`, but wasn't found. "
             f"Found {prompt.input_variables} instead."
         )
-    llm_with_tools = llm.bind(functions=[convert_to_openai_function(t) for t in tools])
+    llm_with_tools = llm.bind(functions=_get_functions_payload(tools))
     agent = (
-        RunnablePassthrough.assign(
-            agent_scratchpad=lambda x: format_to_openai_function_messages(
-                x["intermediate_steps"]
-            )
-        )
+        RunnablePassthrough.assign(agent_scratchpad=_get_agent_scratchpad)
         | prompt
         | llm_with_tools
-        | OpenAIFunctionsAgentOutputParser()
+        | _output_parser
     )
     return agent
@@ -0,0 +1,95 @@
+"""Caching layer for agent plan decisions.
+
+A plan cache short-circuits the LLM round-trip in ``plan``/``aplan`` when the
+agent state (user inputs plus intermediate steps) matches a previously seen
+state, returning the stored ``AgentAction``/``AgentFinish`` directly.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from langchain_core.agents import AgentAction, AgentFinish
+
+PLAN_CACHE_VAL_TYPE = Union[AgentAction, AgentFinish]
+
+
+def plan_cache_key(
+    intermediate_steps: List[Tuple[AgentAction, str]],
+    inputs: Dict[str, Any],
+) -> str:
+    """Build a cache key from the agent state.
+
+    Args:
+        intermediate_steps: Steps the agent has taken to date, along with
+            observations.
+        inputs: The user inputs the prompt is rendered with.
+
+    Returns:
+        A string key that is stable for semantically identical agent states.
+    """
+    steps = tuple(
+        (action.tool, str(action.tool_input), str(observation))
+        for action, observation in intermediate_steps
+    )
+    selected = tuple(sorted((k, str(v)) for k, v in inputs.items()))
+    return repr((steps, selected))
+
+
+class BasePlanCache(ABC):
+    """Interface for caching agent plan decisions.
+
+    The cache interface consists of the following methods:
+
+    - lookup: Look up a stored plan decision based on a state key.
+    - update: Store a plan decision for a state key.
+    - clear: Clear the cache.
+
+    Keys are produced by ``plan_cache_key``; an exact-match implementation can
+    use them directly, while a semantic implementation may embed the key and
+    perform similarity lookup instead.
+    """
+
+    @abstractmethod
+    def lookup(self, key: str) -> Optional[PLAN_CACHE_VAL_TYPE]:
+        """Look up a plan decision based on the state key.
+
+        Args:
+            key: A string representation of the agent state, as produced by
+                ``plan_cache_key``.
+
+        Returns:
+            The stored ``AgentAction``/``AgentFinish`` on a hit, else None.
+        """
+
+    @abstractmethod
+    def update(self, key: str, value: PLAN_CACHE_VAL_TYPE) -> None:
+        """Store a plan decision for the state key.
+
+        Args:
+            key: A string representation of the agent state, as produced by
+                ``plan_cache_key``.
+            value: The parsed ``AgentAction``/``AgentFinish`` to store.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Clear the cache."""
+
+
+class InMemoryPlanCache(BasePlanCache):
+    """Plan cache that stores decisions in memory with exact-match lookup."""
+
+    def __init__(self) -> None:
+        """Initialize with empty cache."""
+        self._cache: Dict[str, PLAN_CACHE_VAL_TYPE] = {}
+
+    def lookup(self, key: str) -> Optional[PLAN_CACHE_VAL_TYPE]:
+        """Look up a plan decision based on the state key."""
+        return self._cache.get(key)
+
+    def update(self, key: str, value: PLAN_CACHE_VAL_TYPE) -> None:
+        """Store a plan decision for the state key."""
+        self._cache[key] = value
+
+    def clear(self) -> None:
+        """Clear the cache."""
+        self._cache = {}
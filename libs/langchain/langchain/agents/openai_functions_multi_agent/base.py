@@ -27,6 +27,7 @@ from langchain.agents import BaseMultiActionAgent
 from langchain.agents.format_scratchpad.openai_functions import (
     format_to_openai_function_messages,
 )
+from langchain.agents.openai_functions_agent.base import _CACHE_CONTROL_KWARGS
 
 # For backwards compatibility
 _FunctionsAgentAction = AgentActionMessageLog
@@ -253,6 +254,7 @@ class OpenAIMultiFunctionsAgent(BaseMultiActionAgent):
             content="You are a helpful AI assistant."
         ),
         extra_prompt_messages: Optional[List[BaseMessagePromptTemplate]] = None,
+        cache_static_prefix: bool = False,
     ) -> BasePromptTemplate:
         """Create prompt for this agent.
 
@@ -261,6 +263,11 @@ class OpenAIMultiFunctionsAgent(BaseMultiActionAgent):
                 first in the prompt.
             extra_prompt_messages: Prompt messages that will be placed between the
                 system message and the new human input.
+            cache_static_prefix: If True, mark the system message and the last
+                message before the agent scratchpad with provider cache-control
+                metadata, so providers that support prompt caching can reuse
+                the static prefix across plan turns. Only enable this for
+                providers that accept ``cache_control`` on messages.
 
         Returns:
             A prompt template to pass into this agent.
@@ -268,6 +275,15 @@ class OpenAIMultiFunctionsAgent(BaseMultiActionAgent):
         _prompts = extra_prompt_messages or []
         messages: List[Union[BaseMessagePromptTemplate, BaseMessage]]
         if system_message:
+            if cache_static_prefix:
+                system_message = system_message.copy(
+                    update={
+                        "additional_kwargs": {
+                            **system_message.additional_kwargs,
+                            **_CACHE_CONTROL_KWARGS,
+                        }
+                    }
+                )
             messages = [system_message]
         else:
             messages = []
@@ -275,7 +291,12 @@ class OpenAIMultiFunctionsAgent(BaseMultiActionAgent):
         messages.extend(
             [
                 *_prompts,
-                HumanMessagePromptTemplate.from_template("{input}"),
+                HumanMessagePromptTemplate.from_template(
+                    "{input}",
+                    additional_kwargs=(
+                        dict(_CACHE_CONTROL_KWARGS) if cache_static_prefix else {}
+                    ),
+                ),
                 MessagesPlaceholder(variable_name="agent_scratchpad"),
             ]
         )
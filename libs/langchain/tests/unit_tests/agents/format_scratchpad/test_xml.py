@@ -1,6 +1,7 @@
 from langchain_core.agents import AgentAction
+from langchain_core.messages import HumanMessage
 
-from langchain.agents.format_scratchpad.xml import format_xml
+from langchain.agents.format_scratchpad.xml import format_xml, format_xml_messages
 
 
 def test_single_agent_action_observation() -> None:
@@ -39,3 +40,38 @@ Observation2</observation>"""
 def test_empty_list_agent_actions() -> None:
     result = format_xml([])
     assert result == ""
+
+
+def test_format_xml_messages() -> None:
+    agent_action1 = AgentAction(tool="Tool1", tool_input="Input1", log="Log1")
+    agent_action2 = AgentAction(tool="Tool2", tool_input="Input2", log="Log2")
+    intermediate_steps = [
+        (agent_action1, "Observation1"),
+        (agent_action2, "Observation2"),
+    ]
+
+    result = format_xml_messages(intermediate_steps)
+
+    expected_content = (
+        '<step index="0"><action tool="Tool1">Input1</action>'
+        "<observation>Observation1</observation></step>"
+        '<step index="1"><action tool="Tool2">Input2</action>'
+        "<observation>Observation2</observation></step>"
+    )
+    assert result == [HumanMessage(content=expected_content)]
+
+
+def test_format_xml_messages_prefix_is_stable() -> None:
+    agent_action1 = AgentAction(tool="Tool1", tool_input="Input1", log="Log1")
+    agent_action2 = AgentAction(tool="Tool2", tool_input="Input2", log="Log2")
+
+    one_step = format_xml_messages([(agent_action1, "Observation1")])
+    two_steps = format_xml_messages(
+        [(agent_action1, "Observation1"), (agent_action2, "Observation2")]
+    )
+
+    assert two_steps[0].content.startswith(one_step[0].content)
+
+
+def test_format_xml_messages_empty() -> None:
+    assert format_xml_messages([]) == []
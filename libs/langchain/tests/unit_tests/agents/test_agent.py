@@ -764,6 +764,63 @@ async def test_runnable_with_multi_action_per_step() -> None:
     assert messages == ["looking", " ", "for", " ", "pet...", "Found", " ", "Pet"]
 
 
+async def test_multi_action_step_with_parallel_unsafe_tool() -> None:
+    """Tools marked parallel_safe=False run, and step order matches emission."""
+    infinite_cycle = cycle([AIMessage(content="looking for pet...")])
+    model = GenericFakeChatModel(messages=infinite_cycle)
+
+    template = ChatPromptTemplate.from_messages(
+        [("system", "You are Cat Agent 007"), ("human", "{question}")]
+    )
+
+    parser_responses = cycle(
+        [
+            [
+                AgentAction(
+                    tool="find_pet", tool_input={"pet": "cat"}, log="find_pet()"
+                ),
+                AgentAction(tool="pet_pet", tool_input={"pet": "cat"}, log="pet_pet()"),
+            ],
+            AgentFinish(return_values={"foo": "meow"}, log="hard-coded-message"),
+        ],
+    )
+
+    def fake_parse(inputs: dict) -> Union[AgentFinish, AgentAction]:
+        """A parser."""
+        return cast(Union[AgentFinish, AgentAction], next(parser_responses))
+
+    @tool
+    def find_pet(pet: str) -> str:
+        """Find the given pet."""
+        return "Spying from under the bed."
+
+    @tool
+    def pet_pet(pet: str) -> str:
+        """Pet the given pet."""
+        return "purrrr"
+
+    # Petting mutates shared state, so it must not run concurrently.
+    pet_pet.metadata = {"parallel_safe": False}
+
+    agent = template | model | fake_parse
+    executor = AgentExecutor(
+        agent=agent,  # type: ignore[arg-type]
+        tools=[find_pet, pet_pet],
+        return_intermediate_steps=True,
+    )
+
+    result = await executor.ainvoke({"question": "hello"})
+    assert result["foo"] == "meow"
+    # Observations come back in the order the agent emitted the actions.
+    assert [
+        (action.tool, observation)
+        for action, observation in result["intermediate_steps"]
+    ] == [
+        ("find_pet", "Spying from under the bed."),
+        ("pet_pet", "purrrr"),
+    ]
+
+
 def _make_func_invocation(name: str, **kwargs: Any) -> AIMessage:
     """Create an AIMessage that represents a function invocation.
 
@@ -0,0 +1,243 @@
+import pytest
+from langchain_core.agents import AgentAction
+from langchain_core.language_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.prompts.chat import (
+    HumanMessagePromptTemplate,
+    MessagesPlaceholder,
+)
+from langchain_core.tools import Tool
+from langchain_core.utils.function_calling import convert_to_openai_function
+
+from langchain.agents.openai_functions_agent.base import (
+    OpenAIFunctionsAgent,
+    _get_functions_payload,
+    format_tools_for_llm,
+)
+from langchain.agents.openai_functions_agent.plan_cache import (
+    InMemoryPlanCache,
+    plan_cache_key,
+)
+
+
+def _fake_tool() -> Tool:
+    return Tool(name="foo", func=lambda x: x, description="A test tool.")
+
+
+def _function_call_message(name: str, arguments: str) -> AIMessage:
+    return AIMessage(
+        content="",
+        additional_kwargs={"function_call": {"name": name, "arguments": arguments}},
+    )
+
+
+class TestCreatePrompt:
+    def test_default_prompt_has_no_cache_markers(self) -> None:
+        prompt = OpenAIFunctionsAgent.create_prompt()
+        system_message = prompt.messages[0]
+        assert isinstance(system_message, SystemMessage)
+        assert "cache_control" not in system_message.additional_kwargs
+        human_template = prompt.messages[1]
+        assert isinstance(human_template, HumanMessagePromptTemplate)
+        assert "cache_control" not in human_template.additional_kwargs
+
+    def test_cache_static_prefix(self) -> None:
+        prompt = OpenAIFunctionsAgent.create_prompt(cache_static_prefix=True)
+        system_message = prompt.messages[0]
+        assert isinstance(system_message, SystemMessage)
+        assert system_message.additional_kwargs["cache_control"] == {
+            "type": "ephemeral"
+        }
+        human_template = prompt.messages[1]
+        assert isinstance(human_template, HumanMessagePromptTemplate)
+        assert human_template.additional_kwargs["cache_control"] == {
+            "type": "ephemeral"
+        }
+        # The scratchpad placeholder stays after the cache checkpoint.
+        assert isinstance(prompt.messages[-1], MessagesPlaceholder)
+
+    def test_cache_static_prefix_does_not_mutate_system_message(self) -> None:
+        system_message = SystemMessage(content="You are a helpful AI assistant.")
+        prompt = OpenAIFunctionsAgent.create_prompt(
+            system_message=system_message, cache_static_prefix=True
+        )
+        assert "cache_control" not in system_message.additional_kwargs
+        assert "cache_control" in prompt.messages[0].additional_kwargs
+
+    def test_cache_markers_propagate_to_formatted_messages(self) -> None:
+        prompt = OpenAIFunctionsAgent.create_prompt(cache_static_prefix=True)
+        messages = prompt.format_prompt(input="hi", agent_scratchpad=[]).to_messages()
+        assert messages[0].additional_kwargs["cache_control"] == {"type": "ephemeral"}
+        assert messages[1].additional_kwargs["cache_control"] == {"type": "ephemeral"}
+
+
+class TestPlanCache:
+    def test_plan_cache_hit_skips_llm(self) -> None:
+        llm = FakeMessagesListChatModel(
+            responses=[
+                _function_call_message("foo", '{"__arg1": "1"}'),
+                _function_call_message("foo", '{"__arg1": "2"}'),
+            ]
+        )
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(
+            llm=llm, tools=[_fake_tool()], plan_cache=InMemoryPlanCache()
+        )
+        first = agent.plan([], input="hi")
+        second = agent.plan([], input="hi")
+        assert isinstance(first, AgentAction)
+        assert second is first
+        # Only the first call reached the LLM.
+        assert llm.i == 1
+
+    def test_plan_cache_miss_on_new_state(self) -> None:
+        llm = FakeMessagesListChatModel(
+            responses=[
+                _function_call_message("foo", '{"__arg1": "1"}'),
+                _function_call_message("foo", '{"__arg1": "2"}'),
+            ]
+        )
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(
+            llm=llm, tools=[_fake_tool()], plan_cache=InMemoryPlanCache()
+        )
+        first = agent.plan([], input="hi")
+        steps = [(first, "observation")]
+        second = agent.plan(steps, input="hi")
+        assert isinstance(second, AgentAction)
+        # The second response proves a fresh LLM call was made.
+        assert second.tool_input == "2"
+
+    async def test_aplan_uses_cache(self) -> None:
+        llm = FakeMessagesListChatModel(
+            responses=[
+                _function_call_message("foo", '{"__arg1": "1"}'),
+                _function_call_message("foo", '{"__arg1": "2"}'),
+            ]
+        )
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(
+            llm=llm, tools=[_fake_tool()], plan_cache=InMemoryPlanCache()
+        )
+        first = await agent.aplan([], input="hi")
+        second = await agent.aplan([], input="hi")
+        assert second is first
+        assert llm.i == 1
+
+    def test_plan_cache_key_stable(self) -> None:
+        action = AgentAction(tool="foo", tool_input="bar", log="log")
+        key1 = plan_cache_key([(action, "obs")], {"input": "hi"})
+        key2 = plan_cache_key([(action, "obs")], {"input": "hi"})
+        key3 = plan_cache_key([(action, "obs")], {"input": "other"})
+        assert key1 == key2
+        assert key1 != key3
+
+
+class TestPlanBatch:
+    def test_plan_batch(self) -> None:
+        llm = FakeMessagesListChatModel(
+            responses=[
+                _function_call_message("foo", '{"__arg1": "1"}'),
+                _function_call_message("foo", '{"__arg1": "2"}'),
+            ]
+        )
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(llm=llm, tools=[_fake_tool()])
+        decisions = agent.plan_batch([{"input": "first"}, {"input": "second"}])
+        assert len(decisions) == 2
+        assert all(isinstance(d, AgentAction) for d in decisions)
+        assert [d.tool_input for d in decisions] == ["1", "2"]
+
+    def test_plan_batch_mismatched_steps(self) -> None:
+        llm = FakeMessagesListChatModel(responses=[])
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(llm=llm, tools=[_fake_tool()])
+        with pytest.raises(ValueError, match="one entry per input"):
+            agent.plan_batch([{"input": "first"}, {"input": "second"}], [[]])
+
+    async def test_aplan_batch(self) -> None:
+        llm = FakeMessagesListChatModel(
+            responses=[
+                _function_call_message("foo", '{"__arg1": "1"}'),
+                _function_call_message("foo", '{"__arg1": "2"}'),
+            ]
+        )
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(llm=llm, tools=[_fake_tool()])
+        decisions = await agent.aplan_batch([{"input": "first"}, {"input": "second"}])
+        assert [d.tool_input for d in decisions] == ["1", "2"]
+
+
+class TestFormatToolsForLLM:
+    def test_default_matches_openai_functions(self) -> None:
+        tool = _fake_tool()
+        rendered = format_tools_for_llm([tool])
+        assert rendered == [convert_to_openai_function(tool)]
+
+    def test_compact_strips_overhead(self) -> None:
+        rendered = format_tools_for_llm([_fake_tool()], serializer="compact")[0]
+        assert rendered["name"] == "foo"
+        parameters = rendered["parameters"]
+        assert "title" not in parameters
+        # "type": "object" is implied by the presence of properties.
+        assert "type" not in parameters
+        assert "properties" in parameters
+
+    def test_callable_serializer(self) -> None:
+        rendered = format_tools_for_llm(
+            [_fake_tool()], serializer=lambda t: {"name": t.name}
+        )
+        assert rendered == [{"name": "foo"}]
+
+    def test_invalid_serializer(self) -> None:
+        with pytest.raises(ValueError, match="serializer should be"):
+            format_tools_for_llm([_fake_tool()], serializer="bogus")
+
+    def test_agent_uses_serializer(self) -> None:
+        llm = FakeMessagesListChatModel(responses=[])
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(
+            llm=llm, tools=[_fake_tool()], functions_serializer="compact"
+        )
+        assert "title" not in agent.functions[0]["parameters"]
+
+
+class TestFunctionsPayloadCache:
+    def test_same_tools_reuse_payload(self) -> None:
+        tool = _fake_tool()
+        first = _get_functions_payload([tool])
+        second = _get_functions_payload([tool])
+        assert second is first
+        assert first == [convert_to_openai_function(tool)]
+
+    def test_different_tools_get_fresh_payload(self) -> None:
+        tool = _fake_tool()
+        other = Tool(name="bar", func=lambda x: x, description="Another tool.")
+        assert _get_functions_payload([tool]) is not _get_functions_payload([other])
+
+
+class TestStreamingPlan:
+    async def test_aplan_streaming(self) -> None:
+        llm = FakeMessagesListChatModel(
+            responses=[_function_call_message("foo", '{"__arg1": "1"}')]
+        )
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(
+            llm=llm, tools=[_fake_tool()], streaming=True
+        )
+        decision = await agent.aplan([], input="hi")
+        assert isinstance(decision, AgentAction)
+        assert decision.tool == "foo"
+        assert decision.tool_input == "1"
+
+
+class TestXmlScratchpad:
+    def test_plan_with_xml_scratchpad(self) -> None:
+        llm = FakeMessagesListChatModel(
+            responses=[_function_call_message("foo", '{"__arg1": "1"}')]
+        )
+        agent = OpenAIFunctionsAgent.from_llm_and_tools(
+            llm=llm, tools=[_fake_tool()], scratchpad_format="xml"
+        )
+        action = AgentAction(tool="foo", tool_input="bar", log="log")
+        decision = agent.plan([(action, "obs")], input="hi")
+        assert isinstance(decision, AgentAction)
+        # The scratchpad collapses into one tag-delimited human message.
+        prompt = agent._prepare_batch_prompt({"input": "hi"}, [(action, "obs")])
+        scratchpad = prompt.to_messages()[2:]
+        assert len(scratchpad) == 1
+        assert '<step index="0"><action tool="foo">bar</action>' in (
+            scratchpad[0].content
+        )